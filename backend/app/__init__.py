@@ -4,5 +4,5 @@ Backend Application
 
 __version__ = "0.1.0"
 
-# Firebase is initialized in main.py
-# Do not initialize Firebase here to avoid multiple initialization issues 
\ No newline at end of file
+# The Firestore client is created lazily by get_db() in db.py on first use
+# Do not create clients here; importing the package must not touch Firestore 
\ No newline at end of file
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, HTTPException, Body
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, HTTPException, Body, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from datetime import datetime
 import uuid
-from google.cloud.firestore_v1.client import Client
-from pydantic import BaseModel
+import orjson
+from google.api_core.exceptions import NotFound
+from google.cloud.firestore import SERVER_TIMESTAMP, FieldFilter
+from google.cloud.firestore_v1.field_path import FieldPath
 from app.db import get_db
+from app.models.customer import CustomerCreate, CustomerBatchGet, MAX_BATCH_WRITES
 
 router = APIRouter(
     prefix="/api/customers",
@@ -12,131 +16,195 @@ router = APIRouter(
     responses={404: {"description": "Not found"}}
 )
 
-# Customer model
-class Customer:
-    def __init__(self, id: str, first_name: str, last_name: str, email: Optional[str] = None,
-                 created_at: Optional[str] = None, updated_at: Optional[str] = None):
-        self.id = id
-        self.first_name = first_name
-        self.last_name = last_name
-        self.email = email
-        self.created_at = created_at or datetime.now().isoformat()
-        self.updated_at = updated_at or datetime.now().isoformat()
-    
-    @classmethod
-    def from_dict(cls, id: str, data: Dict[str, Any]):
-        return cls(
-            id=id,
-            first_name=str(data.get("first_name", "")),
-            last_name=str(data.get("last_name", "")),
-            email=data.get("email"),
-            created_at=data.get("created_at"),
-            updated_at=data.get("updated_at")
-        )
-    
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "first_name": self.first_name,
-            "last_name": self.last_name,
-            "email": self.email,
-            "created_at": self.created_at,
-            "updated_at": self.updated_at
-        }
+def customer_from_doc(doc):
+    """Build the response dict for a customer document snapshot"""
+    # to_dict() already returns a fresh copy, so the id can be added in place
+    customer = doc.to_dict()
+    customer["id"] = doc.id
+    return customer
+
 
+def _json_default(value):
+    """Encode values orjson does not handle natively, such as Firestore timestamps"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
 
-# Customer input models
-class CustomerCreate(BaseModel):
-    first_name: str
-    last_name: str
-    email: Optional[str] = None
 
+async def stream_customer_page(first_doc, docs, limit):
+    """
+    Yield a page of customers as chunks of one JSON document
+    Each document is encoded as it arrives from Firestore, so the page is never held in memory
+    """
+    yield b'{"items":['
+    count = 0
+    last_id = None
+    doc = first_doc
+    while doc is not None:
+        if count:
+            yield b","
+        yield orjson.dumps(customer_from_doc(doc), default=_json_default)
+        count += 1
+        last_id = doc.id
+        doc = await anext(docs, None)
+    
+    next_cursor = last_id if count == limit else None
+    yield b'],"next_cursor":' + orjson.dumps(next_cursor) + b"}"
 
-@router.get("/", response_model=List[dict])
-async def get_customers():
-    """Retrieve all customers"""
+
+@router.get("/")
+async def get_customers(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. first_name,email"),
+    email: Optional[str] = Query(None, description="Only return customers with this email")
+):
+    """Retrieve a page of customers ordered by ID"""
     try:
-        db = get_db()
-        customers = []
+        db = await get_db()
         
-        for doc in db.collection("customers").stream():
-            customer = Customer.from_dict(doc.id, doc.to_dict())
-            customers.append(customer.to_dict())
+        # Keyset pagination: resuming after the last seen ID keeps each page's cost
+        # independent of how far into the collection it is, unlike offset()
+        query = db.collection("customers").order_by(FieldPath.document_id()).limit(limit)
+        try:
+            if cursor:
+                # The cursor is only resolved to a document path when the query is sent,
+                # so check it here: a document ID can never contain "/"
+                if "/" in cursor:
+                    raise ValueError(f"Invalid cursor: {cursor}")
+                query = query.start_after({FieldPath.document_id(): cursor})
+            
+            # Filter and project on the server so only the needed documents and fields are sent
+            if email is not None:
+                query = query.where(filter=FieldFilter("email", "==", email))
+            if fields:
+                query = query.select([field.strip() for field in fields.split(",") if field.strip()])
+        except ValueError as e:
+            # Malformed cursors and field paths are rejected while building the query
+            raise HTTPException(status_code=400, detail=f"Invalid query parameters: {str(e)}")
         
-        return customers
+        # Wait for the first document so query errors still surface as a 500
+        docs = query.stream()
+        first_doc = await anext(docs, None)
+        
+        return StreamingResponse(
+            stream_customer_page(first_doc, docs, limit),
+            media_type="application/json"
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving customers: {str(e)}")
 
 
-@router.get("/{customer_id}", response_model=dict)
+@router.get("/{customer_id}")
 async def get_customer(customer_id: str):
     """Retrieve a specific customer by ID"""
     try:
-        db = get_db()
-        doc = db.collection("customers").document(customer_id).get()
+        db = await get_db()
+        doc = await db.collection("customers").document(customer_id).get()
         
         if not doc.exists:
             raise HTTPException(status_code=404, detail=f"Customer with ID {customer_id} not found")
         
-        return Customer.from_dict(doc.id, doc.to_dict()).to_dict()
+        return customer_from_doc(doc)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving customer: {str(e)}")
 
 
-@router.post("/", response_model=dict, status_code=201)
+@router.post("/", status_code=201)
 async def create_customer(customer: CustomerCreate = Body(...)):
     """Create a new customer"""
     try:
-        db = get_db()
+        db = await get_db()
         
         customer_id = str(uuid.uuid4())
-        now = datetime.now().isoformat()
-        
-        new_customer = Customer(
-            id=customer_id,
-            first_name=customer.first_name,
-            last_name=customer.last_name,
-            email=customer.email,
-            created_at=now,
-            updated_at=now
-        )
+        customer_data = customer.model_dump()
+        customer_data["created_at"] = customer_data["updated_at"] = SERVER_TIMESTAMP
         
-        # Save to Firestore (excluding id from the stored document)
-        db.collection("customers").document(customer_id).set(
-            {k: v for k, v in new_customer.to_dict().items() if k != "id"}
-        )
+        # The id is the document key, so it is not part of the stored document.
+        # create() fails instead of overwriting if the id is somehow taken, and
+        # the response is built locally rather than read back
+        write_result = await db.collection("customers").document(customer_id).create(customer_data)
         
-        return new_customer.to_dict()
+        # Server timestamps resolve to the commit time reported by the write
+        customer_data["created_at"] = customer_data["updated_at"] = write_result.update_time
+        customer_data["id"] = customer_id
+        return customer_data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error creating customer: {str(e)}")
 
 
-@router.put("/{customer_id}", response_model=dict)
+@router.post("/bulk", status_code=201)
+async def create_customers_bulk(
+    customers: List[CustomerCreate] = Body(..., min_length=1, max_length=MAX_BATCH_WRITES)
+):
+    """Create up to MAX_BATCH_WRITES customers in one atomic batched write"""
+    try:
+        db = await get_db()
+        collection = db.collection("customers")
+        batch = db.batch()
+        created = []
+        
+        # A single commit RPC for the whole request; either every customer is stored or none is
+        for customer in customers:
+            customer_id = str(uuid.uuid4())
+            customer_data = customer.model_dump()
+            customer_data["created_at"] = customer_data["updated_at"] = SERVER_TIMESTAMP
+            batch.create(collection.document(customer_id), customer_data)
+            created.append((customer_id, customer_data))
+        write_results = await batch.commit()
+        
+        for (customer_id, customer_data), write_result in zip(created, write_results):
+            customer_data["created_at"] = customer_data["updated_at"] = write_result.update_time
+            customer_data["id"] = customer_id
+        
+        return [customer_data for _, customer_data in created]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error creating customers: {str(e)}")
+
+
+@router.post(":batchGet")
+async def get_customers_bulk(request: CustomerBatchGet = Body(...)):
+    """Retrieve many customers by ID in a single request, skipping unknown IDs"""
+    try:
+        db = await get_db()
+        collection = db.collection("customers")
+        customers = []
+        
+        async for doc in db.get_all([collection.document(customer_id) for customer_id in request.ids]):
+            if doc.exists:
+                customers.append(customer_from_doc(doc))
+        
+        return customers
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving customers: {str(e)}")
+
+
+@router.put("/{customer_id}")
 async def update_customer(customer_id: str, customer: CustomerCreate = Body(...)):
     """Update an existing customer"""
     try:
-        db = get_db()
+        db = await get_db()
         doc_ref = db.collection("customers").document(customer_id)
-        doc = doc_ref.get()
         
-        if not doc.exists:
-            raise HTTPException(status_code=404, detail=f"Customer with ID {customer_id} not found")
-        
-        # Update customer data
-        updated_customer = Customer.from_dict(customer_id, doc.to_dict())
-        updated_customer.first_name = customer.first_name
-        updated_customer.last_name = customer.last_name
-        updated_customer.email = customer.email
-        updated_customer.updated_at = datetime.now().isoformat()
+        updates = {
+            "first_name": customer.first_name,
+            "last_name": customer.last_name,
+            "email": customer.email,
+            "updated_at": SERVER_TIMESTAMP
+        }
         
-        # Save updates (excluding id)
-        doc_ref.update({k: v for k, v in updated_customer.to_dict().items() if k != "id"})
+        # update() fails with NOT_FOUND for missing documents, so no existence read is needed
+        write_result = await doc_ref.update(updates)
         
-        return updated_customer.to_dict()
-    except HTTPException:
-        raise
+        updates["updated_at"] = write_result.update_time
+        updates["id"] = customer_id
+        return updates
+    except NotFound:
+        raise HTTPException(status_code=404, detail=f"Customer with ID {customer_id} not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating customer: {str(e)}")
 
@@ -145,17 +213,14 @@ async def update_customer(customer_id: str, customer: CustomerCreate = Body(...)
 async def delete_customer(customer_id: str):
     """Delete a customer"""
     try:
-        db = get_db()
+        db = await get_db()
         doc_ref = db.collection("customers").document(customer_id)
-        doc = doc_ref.get()
         
-        if not doc.exists:
-            raise HTTPException(status_code=404, detail=f"Customer with ID {customer_id} not found")
-        
-        doc_ref.delete()
+        # Require the document to exist so a missing customer surfaces as NOT_FOUND
+        await doc_ref.delete(option=db.write_option(exists=True))
         return None
-    except HTTPException:
-        raise
+    except NotFound:
+        raise HTTPException(status_code=404, detail=f"Customer with ID {customer_id} not found")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting customer: {str(e)}") 
     
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from datetime import datetime
 import platform
 import os
+import threading
+import time
+import orjson
 import psutil
+from app.db import db_init_failed
 
 router = APIRouter(
     prefix="/api/health",
@@ -10,28 +14,68 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# Deployment settings are fixed for the life of the process
+APP_VERSION = os.environ.get("APP_VERSION", "0.1.0")
+ENVIRONMENT = os.environ.get("ENVIRONMENT", "development")
+
+# Probe payloads never vary, so they are serialized once and sent as raw bytes
+ALIVE_BYTES = orjson.dumps({"status": "alive"})
+READY_BYTES = orjson.dumps({"status": "ready"})
+NOT_READY_BYTES = orjson.dumps({"status": "not_ready", "reason": "firestore_init_failed"})
+
+# Platform details never change for the life of the process
+PLATFORM_INFO = {
+    "python_version": platform.python_version(),
+    "platform": platform.platform(),
+    "processor": platform.processor(),
+}
+
+# How long a system info sample is shared between health checks
+SYSTEM_INFO_TTL_SECONDS = 1.0
+
+_system_info_cache = {"ts": 0.0, "data": None}
+_system_info_lock = threading.Lock()
+
+# Prime the CPU counters so the first non-blocking sample is meaningful
+psutil.cpu_percent(interval=None)
+
 def get_system_info():
-    """Gather system information for health reporting"""
-    return {
-        "python_version": platform.python_version(),
-        "platform": platform.platform(),
-        "processor": platform.processor(),
-        "cpu_usage": psutil.cpu_percent(interval=0.1),
-        "memory_usage": psutil.virtual_memory().percent,
-        "disk_usage": psutil.disk_usage('/').percent
-    }
+    """Gather system information for health reporting, cached for a short TTL"""
+    with _system_info_lock:
+        now = time.monotonic()
+        if _system_info_cache["data"] is None or now - _system_info_cache["ts"] >= SYSTEM_INFO_TTL_SECONDS:
+            _system_info_cache["data"] = {
+                **PLATFORM_INFO,
+                # Non-blocking: usage since the previous sample
+                "cpu_usage": psutil.cpu_percent(interval=None),
+                "memory_usage": psutil.virtual_memory().percent,
+                "disk_usage": psutil.disk_usage('/').percent
+            }
+            _system_info_cache["ts"] = now
+        return _system_info_cache["data"]
+
+def readiness_response():
+    """
+    Build the readiness probe response
+    Reports 503 while a failed Firestore initialization is inside its retry backoff,
+    so the platform stops routing traffic to an instance that cannot serve it
+    """
+    if db_init_failed():
+        return Response(content=NOT_READY_BYTES, status_code=503, media_type="application/json")
+    return Response(content=READY_BYTES, media_type="application/json")
 
 @router.get("/")
 async def health_check():
     """
     Comprehensive health check endpoint
     Returns detailed information about API health and system status
+    Load balancer and platform health checks should use /live or /ready instead
     """
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "version": os.environ.get("APP_VERSION", "0.1.0"),
-        "environment": os.environ.get("ENVIRONMENT", "development"),
+        "version": APP_VERSION,
+        "environment": ENVIRONMENT,
         "system_info": get_system_info()
     }
 
@@ -41,7 +85,7 @@ async def liveness_check():
     Liveness probe for Kubernetes/Cloud Run
     Used to determine if the application is running and responsive
     """
-    return {"status": "alive"}
+    return Response(content=ALIVE_BYTES, media_type="application/json")
 
 @router.get("/ready")
 async def readiness_check():
@@ -49,4 +93,4 @@ async def readiness_check():
     Readiness probe for Kubernetes/Cloud Run
     Used to determine if the application is ready to receive traffic
     """
-    return {"status": "ready"} 
\ No newline at end of file
+    return readiness_response() 
\ No newline at end of file
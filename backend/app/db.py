@@ -1,80 +1,116 @@
-from firebase_admin import firestore, initialize_app, get_app, credentials
+from fastapi.concurrency import run_in_threadpool
+from google.cloud.firestore import AsyncClient
+from google.oauth2 import service_account
+import logging
 import os
-import traceback
+import threading
+import time
 
-def get_db():
+# The Firestore client keeps its own gRPC channel and is safe to share, so one
+# client is created per process and reused by every request
+_DB_CLIENT = None
+_DB_LOCK = threading.Lock()
+
+# A failed initialization is remembered for a short backoff window so a burst of
+# requests does not repeat credential discovery (which can block on the metadata
+# server); the next call after the window retries, since failures may be transient
+DB_INIT_RETRY_SECONDS = 30.0
+_DB_INIT_ERROR = None
+_DB_INIT_FAILED_AT = 0.0
+
+logger = logging.getLogger(__name__)
+
+# Set DB_DEBUG to trace client initialization
+if os.environ.get("DB_DEBUG"):
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(logging.StreamHandler())
+
+async def get_db() -> AsyncClient:
+    """
+    Get the shared async Firestore client, creating it on first use
+    Credential discovery does blocking file and network I/O, so the first call
+    runs it in the threadpool instead of on the event loop
+    """
+    if _DB_CLIENT is not None:
+        return _DB_CLIENT
+    return await run_in_threadpool(_get_or_init_db)
+
+def db_init_failed():
+    """
+    Whether the last initialization attempt failed within the retry backoff window
+    """
+    return (
+        _DB_CLIENT is None
+        and _DB_INIT_ERROR is not None
+        and time.monotonic() - _DB_INIT_FAILED_AT < DB_INIT_RETRY_SECONDS
+    )
+
+def get_db_status():
+    """
+    Report whether the Firestore client exists, without triggering initialization
     """
-    Get a Firestore client
+    return "connected" if _DB_CLIENT is not None else "not_connected"
+
+def _get_or_init_db():
+    """
+    Return the client, initializing it under the lock unless a recent attempt failed
+    """
+    with _DB_LOCK:
+        if _DB_CLIENT is None:
+            if db_init_failed():
+                raise RuntimeError("Firestore client initialization failed recently") from _DB_INIT_ERROR
+            _init_db()
+    return _DB_CLIENT
+
+def _init_db():
+    """
+    Create the async Firestore client
     """
+    global _DB_CLIENT
+    global _DB_INIT_ERROR
+    global _DB_INIT_FAILED_AT
+
     try:
-        print("========== DB INITIALIZATION DEBUG ==========")
-        print("1. Checking if Firebase app is already initialized")
-        
-        # Try to get existing app
-        try:
-            app = get_app()
-            print(f"2. Firebase app already initialized: {app}")
-        except ValueError:
-            print("3. No existing Firebase app found, initializing...")
-            
-            # Get the current environment
-            env = os.environ.get("ENVIRONMENT", "dev")
-            print(f"4. Current environment: {env}")
-            
-            # Prioritize checking for environment-specific Firebase credentials in secrets directory
-            firebase_cred_path = f"secrets/firebase-admin-key-{env}.json"
-            
-            # For Cloud Run deployment, the path might be mounted at /secrets
-            cloud_run_cred_path = f"/secrets/firebase-admin-key-{env}.json"
-            
-            if os.path.exists(firebase_cred_path):
-                print(f"5. Found Firebase credentials at {firebase_cred_path}")
-                try:
-                    cred = credentials.Certificate(firebase_cred_path)
-                    app = initialize_app(cred)
-                    print("6. Firebase initialized with environment-specific service account credentials")
-                except Exception as e:
-                    print(f"Error initializing with service account: {e}")
-                    print("Falling back to default credentials...")
-                    app = initialize_app()
-                    print("6. Firebase initialized with default configuration")
-            elif os.path.exists(cloud_run_cred_path):
-                print(f"5. Found Firebase credentials at {cloud_run_cred_path}")
-                try:
-                    cred = credentials.Certificate(cloud_run_cred_path)
-                    app = initialize_app(cred)
-                    print("6. Firebase initialized with environment-specific service account credentials (Cloud Run)")
-                except Exception as e:
-                    print(f"Error initializing with service account: {e}")
-                    print("Falling back to default credentials...")
-                    app = initialize_app()
-                    print("6. Firebase initialized with default configuration")
-            else:
-                # Check for Application Default Credentials (ADC) path
-                adc_path = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
-                if adc_path and os.path.exists(adc_path):
-                    print(f"5. Found Application Default Credentials at {adc_path}")
-                    try:
-                        cred = credentials.Certificate(adc_path)
-                        app = initialize_app(cred)
-                        print("6. Firebase initialized with ADC credentials")
-                    except Exception as e:
-                        print(f"Error initializing with ADC: {e}")
-                        print("Falling back to default credentials...")
-                        app = initialize_app()
-                        print("6. Firebase initialized with default configuration")
-                else:
-                    # Initialize with default credentials
-                    print("5. No explicit credentials found, using default")
-                    app = initialize_app()
-                    print("6. Firebase initialized with default configuration")
-        
-        print("7. Getting Firestore client")
-        db = firestore.client()
-        print(f"8. Firestore client obtained: {db}")
-        print("========== END DB DEBUG ==========")
-        return db
+        logger.debug("========== DB INITIALIZATION DEBUG ==========")
+
+        # Get the current environment
+        env = os.environ.get("ENVIRONMENT", "dev")
+        logger.debug("1. Current environment: %s", env)
+
+        # Default credentials are used unless a service account key is found
+        cred = None
+
+        # Service account keys in priority order: the local secrets directory, the
+        # Cloud Run secret mount, then GOOGLE_APPLICATION_CREDENTIALS
+        candidates = (
+            f"secrets/firebase-admin-key-{env}.json",
+            f"/secrets/firebase-admin-key-{env}.json",
+            os.environ.get("GOOGLE_APPLICATION_CREDENTIALS"),
+        )
+        for cred_path in candidates:
+            if not cred_path:
+                continue
+            # Opening the key directly avoids a separate existence check per candidate
+            try:
+                cred = service_account.Credentials.from_service_account_file(cred_path)
+                logger.debug("2. Using service account credentials from %s", cred_path)
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                logger.warning("Error loading %s, falling back to default credentials: %s", cred_path, e)
+            break
+        else:
+            logger.debug("2. No explicit credentials found, using default")
+
+        project = cred.project_id if cred is not None else None
+        db = AsyncClient(project=project, credentials=cred)
+
+        logger.debug("3. Created Firestore client for project %s", db.project)
+        logger.debug("========== END DB DEBUG ==========")
+        _DB_CLIENT = db
+        _DB_INIT_ERROR = None
     except Exception as e:
-        print(f"ERROR initializing Firestore: {str(e)}")
-        traceback.print_exc()
-        raise
\ No newline at end of file
+        logger.exception("Firestore initialization failed")
+        _DB_INIT_ERROR = e
+        _DB_INIT_FAILED_AT = time.monotonic()
+        raise
@@ -1,53 +1,136 @@
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from firebase_admin import credentials, firestore, initialize_app
+from fastapi.responses import ORJSONResponse
 import os
 import json
+import hashlib
+import tempfile
 from datetime import datetime
-import uvicorn
-import yaml
 
 # Import routers
-from app.api.health import router as health_router
+from app.api.health import router as health_router, readiness_response
 from app.api.customers import router as customers_router
+from app.db import get_db_status
+
+# config.yaml at the repository root, or mounted at the filesystem root in containers
+_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'config.yaml')
+_FALLBACK_CONFIG_PATH = '/config.yaml'
+
+# Parsed JSON copies of config files are kept outside the source tree, keyed by the
+# source path, so importing the app never writes next to config.yaml
+_CONFIG_CACHE_DIR = os.environ.get(
+    'CONFIG_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'app-config-cache')
+)
+
+# Parsed config files keyed by path, each stored with the (mtime_ns, size) it was read at
+_config_cache = {}
+
+def _json_cache_path(path):
+    """
+    Location of the JSON copy of a config file in the cache directory
+    """
+    digest = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()
+    return os.path.join(_CONFIG_CACHE_DIR, digest + '.json')
+
+def _has_only_string_keys(value):
+    """
+    Whether every mapping in value uses string keys, so it survives a JSON round trip
+    """
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and _has_only_string_keys(item) for key, item in value.items())
+    if isinstance(value, list):
+        return all(_has_only_string_keys(item) for item in value)
+    return True
+
+def _write_json_cache(json_path, source, data):
+    """
+    Atomically write parsed config with the stat of its YAML source; failures are ignored
+    """
+    # json would turn int or bool keys into strings, so such configs are not cached
+    if not _has_only_string_keys(data):
+        return
+    tmp_path = None
+    try:
+        os.makedirs(_CONFIG_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=_CONFIG_CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'w') as file:
+            json.dump({'source': list(source), 'data': data}, file)
+        os.replace(tmp_path, json_path)
+    except (OSError, TypeError, ValueError):
+        # Read-only filesystems and non-JSON values just skip the cache
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+def read_yaml_config(path):
+    """
+    Parse a YAML config file, reusing the previous result while the file is unchanged
+    A JSON copy recorded for the exact same mtime_ns and size is loaded instead,
+    since json parsing is much faster; it is rewritten whenever the YAML is parsed
+    """
+    stat = os.stat(path)
+    source = (stat.st_mtime_ns, stat.st_size)
+    cached = _config_cache.get(path)
+    if cached is not None and cached[0] == source:
+        return cached[1]
+
+    json_path = _json_cache_path(path)
+    try:
+        with open(json_path, 'r') as file:
+            stored = json.load(file)
+        if tuple(stored['source']) == source:
+            data = stored['data']
+            _config_cache[path] = (source, data)
+            return data
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    # yaml is imported only when the JSON copy cannot be used. Prefer the
+    # libyaml-backed loader; it needs PyYAML built with libyaml (the standard
+    # wheels are, otherwise install libyaml-dev and rebuild pyyaml)
+    import yaml
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path, 'r') as file:
+        data = yaml.load(file, Loader=loader)
+    _write_json_cache(json_path, source, data)
+    _config_cache[path] = (source, data)
+    return data
 
 # Load configuration
 def load_config():
     """
     Load configuration from config.yaml file or environment variables
     """
-    # Try to find config in the relative path from the app
-    config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'config.yaml')
-    
-    try:
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as file:
-                return yaml.safe_load(file)
-        elif os.path.exists('/config.yaml'):
-            with open('/config.yaml', 'r') as file:
-                return yaml.safe_load(file)
-    except Exception:
-        pass
+    for path in (_CONFIG_PATH, _FALLBACK_CONFIG_PATH):
+        try:
+            return read_yaml_config(path)
+        except FileNotFoundError:
+            continue
+        except Exception:
+            break
         
     # Fall back to environment variables
-    project_name = os.environ.get('PROJECT_NAME', 'app')
-    project_id = os.environ.get('PROJECT_ID', 'app')
+    env = os.environ
+    project_name = env.get('PROJECT_NAME', 'app')
+    project_id = env.get('PROJECT_ID', 'app')
     return {
         'project': {
             'name': project_name,
             'id': project_id,
             'description': f'{project_name} Application',
-            'region': os.environ.get('REGION', 'us-central1'),
-            'zone': os.environ.get('ZONE', 'us-central1-a')
+            'region': env.get('REGION', 'us-central1'),
+            'zone': env.get('ZONE', 'us-central1-a')
         },
         'application': {
             'backend': {
                 'name': f'{project_id}-api',
-                'port': int(os.environ.get('PORT', 8080))
+                'port': int(env.get('PORT', 8080))
             },
             'frontend': {
                 'name': f'{project_id}-web',
-                'port': int(os.environ.get('FRONTEND_PORT', 3000))
+                'port': int(env.get('FRONTEND_PORT', 3000))
             }
         }
     }
@@ -63,18 +146,38 @@ elif ENVIRONMENT == "staging":
 else:
     ENV_SHORT = "prod"
 
+GCP_PROJECT_ID = os.environ.get("GCP_PROJECT_ID", "local")
+
 # Initialize FastAPI
 app = FastAPI(
     title=f"{config['project']['name']} API",
     description=f"Backend API for {config['project']['description']}",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse
 )
 
+def get_cors_allow_origins(environment, app_config):
+    """
+    Origins allowed by CORS for the given environment
+    Production uses the comma-separated CORS_ALLOW_ORIGINS environment variable
+    (config.yaml is not part of the backend image), falling back to config.yaml
+    for local runs; everything else, and production without a list, allows "*"
+    """
+    if environment not in ("prod", "production"):
+        return ["*"]
+    origins = [origin.strip() for origin in os.environ.get("CORS_ALLOW_ORIGINS", "").split(",") if origin.strip()]
+    return origins or app_config.get('cors_allow_origins') or ["*"]
+
 # Add CORS middleware
+# An explicit origin list is checked by Starlette with a set lookup. Credentials
+# are only allowed for explicit origins, so the wildcard takes Starlette's fast
+# path of a static "*" header instead of echoing each request's origin back.
+CORS_ALLOW_ORIGINS = get_cors_allow_origins(ENVIRONMENT, config)
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
-    allow_credentials=True,
+    allow_origins=CORS_ALLOW_ORIGINS,
+    allow_credentials=CORS_ALLOW_ORIGINS != ["*"],
     allow_methods=["*"],
     allow_headers=["*"],
 )
@@ -83,40 +186,6 @@ app.add_middleware(
 app.include_router(health_router)
 app.include_router(customers_router)
 
-# Initialize Firebase if credentials exist
-firebase_initialized = False
-firebase_app = None
-
-@app.on_event("startup")
-async def startup_db_client():
-    global firebase_initialized
-    global firebase_app
-    
-    try:
-        # Import here to avoid circular imports
-        import firebase_admin
-        from firebase_admin import firestore
-        
-        # Check if Firebase is already initialized
-        try:
-            firebase_app = firebase_admin.get_app()
-            print("Existing Firebase app found and will be used")
-            firebase_initialized = True
-        except ValueError:
-            # Initialize with minimal config
-            firebase_app = firebase_admin.initialize_app()
-            print("Firebase initialized with default configuration")
-            firebase_initialized = True
-        
-        # Test connection
-        firestore.client()
-        print("Firestore client initialized successfully")
-        
-    except Exception as e:
-        print(f"Error initializing Firebase: {e}")
-        import traceback
-        traceback.print_exc()
-
 @app.get("/")
 async def root():
     return {"message": "Welcome to Backend API"}
@@ -130,9 +199,11 @@ async def basic_health_check():
         "status": "ok",
         "timestamp": datetime.now().isoformat(),
         "environment": ENVIRONMENT,
-        "project_id": os.environ.get("GCP_PROJECT_ID", "local"),
+        "project_id": GCP_PROJECT_ID,
         "dependencies": {
-            "firebase": "connected" if firebase_initialized else "not_connected"
+            # Client state only: the probe never initializes Firestore or contacts it,
+            # so this stays "not_connected" until the first request creates the client
+            "firebase": get_db_status()
         }
     }
 
@@ -141,9 +212,11 @@ async def readiness_check():
     """
     Readiness probe for Kubernetes/Cloud Run
     """
-    return {"status": "ready"}
+    return readiness_response()
 
 if __name__ == "__main__":
+    import uvicorn
+
     # Get port from environment variable or use default from config
     port = int(os.environ.get("PORT", config['application']['backend']['port']))
     uvicorn.run("app.main:app", host="0.0.0.0", port=port, reload=True) 
\ No newline at end of file
@@ -0,0 +1 @@
+# models package initialization
\ No newline at end of file
@@ -0,0 +1,20 @@
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+# Firestore accepts at most 500 writes in a single batch commit, so bulk requests
+# are capped there to keep each one a single atomic commit
+MAX_BATCH_WRITES = 500
+
+# Upper bound on IDs per batch get, keeping each BatchGetDocuments call bounded
+MAX_BATCH_GET_IDS = 500
+
+
+# Customer input models
+class CustomerCreate(BaseModel):
+    first_name: str
+    last_name: str
+    email: Optional[str] = None
+
+
+class CustomerBatchGet(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_GET_IDS)
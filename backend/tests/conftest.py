@@ -0,0 +1,21 @@
+"""
+Shared fixtures: a TestClient whose requests use an in-memory Firestore client
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+import app.db
+from app.main import app as fastapi_app
+from tests.fakes import FakeFirestore
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = FakeFirestore()
+    monkeypatch.setattr(app.db, "_DB_CLIENT", fake)
+    return fake
+
+
+@pytest.fixture
+def client(db):
+    return TestClient(fastapi_app)
@@ -0,0 +1,130 @@
+"""
+In-memory stand-in for the async Firestore client used by the customers API
+"""
+import datetime
+
+from google.cloud.firestore import SERVER_TIMESTAMP
+
+
+class FakeWriteResult:
+    def __init__(self, update_time):
+        self.update_time = update_time
+
+
+class FakeSnapshot:
+    def __init__(self, doc_id, data, fields=None):
+        self.id = doc_id
+        self.exists = data is not None
+        self._data = data
+        self._fields = fields
+
+    def to_dict(self):
+        if self._data is None:
+            return None
+        if self._fields is None:
+            return dict(self._data)
+        return {key: value for key, value in self._data.items() if key in self._fields}
+
+
+class FakeDocument:
+    def __init__(self, db, doc_id):
+        self._db = db
+        self.id = doc_id
+
+    async def get(self):
+        return FakeSnapshot(self.id, self._db.store.get(self.id))
+
+    async def create(self, data):
+        return self._db.commit_writes([(self, data)])[0]
+
+
+class FakeQuery:
+    """Supports the document-id ordered queries the customers API builds"""
+
+    def __init__(self, db, limit=None, after=None, filters=(), fields=None):
+        self._db = db
+        self._limit = limit
+        self._after = after
+        self._filters = filters
+        self._fields = fields
+
+    def _copy(self, **changes):
+        state = dict(limit=self._limit, after=self._after, filters=self._filters, fields=self._fields)
+        state.update(changes)
+        return FakeQuery(self._db, **state)
+
+    def document(self, doc_id):
+        return FakeDocument(self._db, doc_id)
+
+    def order_by(self, field_path):
+        return self
+
+    def limit(self, count):
+        return self._copy(limit=count)
+
+    def start_after(self, values):
+        return self._copy(after=values["__name__"])
+
+    def where(self, filter):
+        return self._copy(filters=self._filters + (filter,))
+
+    def select(self, field_paths):
+        return self._copy(fields=list(field_paths))
+
+    async def stream(self):
+        doc_ids = sorted(self._db.store)
+        if self._after is not None:
+            doc_ids = [doc_id for doc_id in doc_ids if doc_id > self._after]
+        for field_filter in self._filters:
+            doc_ids = [
+                doc_id for doc_id in doc_ids
+                if self._db.store[doc_id].get(field_filter.field_path) == field_filter.value
+            ]
+        for doc_id in doc_ids[:self._limit]:
+            yield FakeSnapshot(doc_id, self._db.store[doc_id], self._fields)
+
+
+class FakeBatch:
+    def __init__(self, db):
+        self._db = db
+        self._writes = []
+
+    def create(self, reference, data):
+        self._writes.append((reference, data))
+
+    async def commit(self):
+        return self._db.commit_writes(self._writes)
+
+
+class FakeFirestore:
+    def __init__(self):
+        self.store = {}
+        self.commits = 0
+
+    def add_customers(self, count):
+        """Store count customers with sortable IDs c000, c001, ..."""
+        for index in range(count):
+            self.store[f"c{index:03d}"] = {"first_name": f"first{index}", "last_name": "last", "email": None}
+
+    def collection(self, name):
+        return FakeQuery(self)
+
+    def batch(self):
+        return FakeBatch(self)
+
+    async def get_all(self, references):
+        for reference in references:
+            yield FakeSnapshot(reference.id, self.store.get(reference.id))
+
+    def commit_writes(self, writes):
+        """Apply creates atomically, resolving server timestamps to the commit time"""
+        if any(reference.id in self.store for reference, _ in writes):
+            raise RuntimeError("document already exists")
+        self.commits += 1
+        commit_time = datetime.datetime.now(datetime.timezone.utc)
+        for reference, data in writes:
+            self.store[reference.id] = {
+                key: commit_time if value is SERVER_TIMESTAMP else value
+                for key, value in data.items()
+            }
+        return [FakeWriteResult(commit_time) for _ in writes]
@@ -0,0 +1,42 @@
+import pytest
+
+from app.main import CORS_ALLOW_ORIGINS, get_cors_allow_origins
+
+CONFIG_ORIGINS = {"cors_allow_origins": ["https://config.example.com"]}
+
+
+@pytest.mark.parametrize("environment", ["dev", "development", "staging", "test"])
+def test_non_production_environments_allow_any_origin(monkeypatch, environment):
+    monkeypatch.setenv("CORS_ALLOW_ORIGINS", "https://app.example.com")
+
+    assert get_cors_allow_origins(environment, CONFIG_ORIGINS) == ["*"]
+
+
+@pytest.mark.parametrize("environment", ["prod", "production"])
+def test_production_reads_comma_separated_env_var(monkeypatch, environment):
+    monkeypatch.setenv("CORS_ALLOW_ORIGINS", " https://app.example.com, ,https://admin.example.com ")
+
+    assert get_cors_allow_origins(environment, CONFIG_ORIGINS) == [
+        "https://app.example.com",
+        "https://admin.example.com",
+    ]
+
+
+def test_production_falls_back_to_config(monkeypatch):
+    monkeypatch.delenv("CORS_ALLOW_ORIGINS", raising=False)
+
+    assert get_cors_allow_origins("prod", CONFIG_ORIGINS) == ["https://config.example.com"]
+
+
+def test_production_without_a_list_allows_any_origin(monkeypatch):
+    monkeypatch.setenv("CORS_ALLOW_ORIGINS", "")
+
+    assert get_cors_allow_origins("prod", {}) == ["*"]
+
+
+@pytest.mark.skipif(CORS_ALLOW_ORIGINS != ["*"], reason="app was configured with an explicit origin list")
+def test_wildcard_cors_sends_static_header(client):
+    response = client.get("/", headers={"Origin": "https://anywhere.example.com"})
+
+    assert response.headers["access-control-allow-origin"] == "*"
+    assert "access-control-allow-credentials" not in response.headers
@@ -0,0 +1,74 @@
+from app.models.customer import MAX_BATCH_GET_IDS, MAX_BATCH_WRITES
+
+
+def _customers(count):
+    return [{"first_name": f"first{index}", "last_name": "last"} for index in range(count)]
+
+
+def test_bulk_create_stores_all_customers_in_one_commit(client, db):
+    response = client.post("/api/customers/bulk", json=_customers(3))
+
+    assert response.status_code == 201
+    created = response.json()
+    assert [customer["first_name"] for customer in created] == ["first0", "first1", "first2"]
+    assert db.commits == 1
+    assert sorted(db.store) == sorted(customer["id"] for customer in created)
+    for customer in created:
+        assert customer["created_at"] == customer["updated_at"]
+        assert "id" not in db.store[customer["id"]]
+
+
+def test_bulk_create_accepts_max_batch(client, db):
+    response = client.post("/api/customers/bulk", json=_customers(MAX_BATCH_WRITES))
+
+    assert response.status_code == 201
+    assert len(db.store) == MAX_BATCH_WRITES
+    assert db.commits == 1
+
+
+def test_bulk_create_rejects_empty_body(client, db):
+    response = client.post("/api/customers/bulk", json=[])
+
+    assert response.status_code == 422
+    assert db.commits == 0
+
+
+def test_bulk_create_rejects_oversized_body(client, db):
+    response = client.post("/api/customers/bulk", json=_customers(MAX_BATCH_WRITES + 1))
+
+    assert response.status_code == 422
+    assert db.store == {}
+
+
+def test_bulk_create_is_all_or_nothing(client, db, monkeypatch):
+    ids = iter(["new-1", "taken"])
+    monkeypatch.setattr("app.api.customers.uuid.uuid4", lambda: next(ids))
+    db.store["taken"] = {"first_name": "existing", "last_name": "last"}
+
+    response = client.post("/api/customers/bulk", json=_customers(2))
+
+    assert response.status_code == 500
+    assert list(db.store) == ["taken"]
+
+
+def test_batch_get_returns_known_customers_and_skips_unknown_ids(client, db):
+    db.add_customers(3)
+
+    response = client.post("/api/customers:batchGet", json={"ids": ["c002", "missing", "c000"]})
+
+    assert response.status_code == 200
+    assert [customer["id"] for customer in response.json()] == ["c002", "c000"]
+
+
+def test_batch_get_rejects_empty_ids(client):
+    response = client.post("/api/customers:batchGet", json={"ids": []})
+
+    assert response.status_code == 422
+
+
+def test_batch_get_rejects_too_many_ids(client):
+    ids = [f"c{index}" for index in range(MAX_BATCH_GET_IDS + 1)]
+
+    response = client.post("/api/customers:batchGet", json={"ids": ids})
+
+    assert response.status_code == 422
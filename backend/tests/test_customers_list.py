@@ -0,0 +1,53 @@
+import pytest
+
+
+def test_list_pages_through_all_customers_with_the_cursor(client, db):
+    db.add_customers(5)
+
+    first = client.get("/api/customers/", params={"limit": 2}).json()
+    second = client.get("/api/customers/", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+    third = client.get("/api/customers/", params={"limit": 2, "cursor": second["next_cursor"]}).json()
+
+    assert [customer["id"] for customer in first["items"]] == ["c000", "c001"]
+    assert [customer["id"] for customer in second["items"]] == ["c002", "c003"]
+    assert [customer["id"] for customer in third["items"]] == ["c004"]
+    assert first["next_cursor"] == "c001"
+    assert second["next_cursor"] == "c003"
+    assert third["next_cursor"] is None
+
+
+def test_list_defaults_to_pages_of_100(client, db):
+    db.add_customers(101)
+
+    page = client.get("/api/customers/").json()
+
+    assert len(page["items"]) == 100
+    assert page["next_cursor"] == "c099"
+
+
+@pytest.mark.parametrize("cursor", ["c001/orders/o1", "/", "customers/c001"])
+def test_list_rejects_malformed_cursor(client, db, cursor):
+    db.add_customers(2)
+
+    response = client.get("/api/customers/", params={"cursor": cursor})
+
+    assert response.status_code == 400
+    assert "Invalid cursor" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("limit", [0, 1001])
+def test_list_rejects_out_of_range_limit(client, limit):
+    response = client.get("/api/customers/", params={"limit": limit})
+
+    assert response.status_code == 422
+
+
+def test_list_filters_by_email_and_projects_fields(client, db):
+    db.add_customers(3)
+    db.store["c001"]["email"] = "match@example.com"
+
+    page = client.get(
+        "/api/customers/", params={"email": "match@example.com", "fields": "first_name, email"}
+    ).json()
+
+    assert page["items"] == [{"first_name": "first1", "email": "match@example.com", "id": "c001"}]
@@ -0,0 +1,74 @@
+import asyncio
+import datetime
+import json
+
+from app.api.customers import stream_customer_page
+from tests.fakes import FakeSnapshot
+
+
+def _collect(first_doc, docs, limit):
+    async def run():
+        return b"".join([chunk async for chunk in stream_customer_page(first_doc, docs, limit)])
+    return asyncio.run(run())
+
+
+async def _iterate(snapshots):
+    for snapshot in snapshots:
+        yield snapshot
+
+
+def _page(count, limit):
+    snapshots = [FakeSnapshot(f"c{index}", {"first_name": f"first{index}"}) for index in range(count)]
+    docs = _iterate(snapshots[1:])
+    return json.loads(_collect(snapshots[0] if snapshots else None, docs, limit))
+
+
+def test_empty_page_has_no_items_and_no_cursor():
+    assert _collect(None, _iterate([]), 10) == b'{"items":[],"next_cursor":null}'
+
+
+def test_short_page_has_no_cursor():
+    page = _page(3, limit=10)
+
+    assert [item["id"] for item in page["items"]] == ["c0", "c1", "c2"]
+    assert page["next_cursor"] is None
+
+
+def test_full_page_points_the_cursor_at_its_last_item():
+    page = _page(10, limit=10)
+
+    assert len(page["items"]) == 10
+    assert page["next_cursor"] == "c9"
+
+
+def test_single_item_page_is_valid_json():
+    page = _page(1, limit=1)
+
+    assert page == {"items": [{"first_name": "first0", "id": "c0"}], "next_cursor": "c0"}
+
+
+def test_timestamps_are_encoded_as_iso_strings():
+    created_at = datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+    snapshot = FakeSnapshot("c0", {"created_at": created_at})
+
+    page = json.loads(_collect(snapshot, _iterate([]), 10))
+
+    assert page["items"][0]["created_at"] == "2024-01-02T03:04:05+00:00"
+
+
+def test_list_endpoint_streams_one_json_document(client, db):
+    db.add_customers(3)
+
+    response = client.get("/api/customers/", params={"limit": 2})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.content.startswith(b'{"items":[{')
+    assert json.loads(response.content)["next_cursor"] == "c001"
+
+
+def test_list_endpoint_streams_empty_collection(client, db):
+    response = client.get("/api/customers/")
+
+    assert response.status_code == 200
+    assert response.content == b'{"items":[],"next_cursor":null}'
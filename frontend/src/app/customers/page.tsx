@@ -13,6 +13,15 @@ interface Customer {
   created_at?: string;
 }
 
+// Paginated list response
+interface CustomerPage {
+  items: Customer[];
+  next_cursor: string | null;
+}
+
+// Largest page the list endpoint accepts, to keep the number of requests low
+const CUSTOMERS_PAGE_SIZE = 1000;
+
 export default function CustomersPage() {
   const [customers, setCustomers] = useState<Customer[]>([]);
   const [loading, setLoading] = useState(false);
@@ -32,19 +41,32 @@ export default function CustomersPage() {
         throw new Error('Backend URL not configured');
       }
 
-      const response = await fetch(`${backendUrl}/api/customers/`, {
-        method: 'GET',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-      });
+      // The list endpoint is paginated, so follow next_cursor until every page is loaded
+      const allCustomers: Customer[] = [];
+      let cursor: string | null = null;
+      do {
+        const params = new URLSearchParams({ limit: String(CUSTOMERS_PAGE_SIZE) });
+        if (cursor) {
+          params.set('cursor', cursor);
+        }
 
-      if (!response.ok) {
-        throw new Error(`Error: ${response.status} ${response.statusText}`);
-      }
+        const response = await fetch(`${backendUrl}/api/customers/?${params}`, {
+          method: 'GET',
+          headers: {
+            'Content-Type': 'application/json',
+          },
+        });
+
+        if (!response.ok) {
+          throw new Error(`Error: ${response.status} ${response.statusText}`);
+        }
+
+        const data: CustomerPage = await response.json();
+        allCustomers.push(...data.items);
+        cursor = data.next_cursor;
+      } while (cursor);
 
-      const data = await response.json();
-      setCustomers(data);
+      setCustomers(allCustomers);
     } catch (err) {
       console.error('Error fetching customers:', err);
       setError(err instanceof Error ? err.message : 'Unknown error occurred');